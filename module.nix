@@ -39,6 +39,13 @@ in
         description = mdDoc "Result directory.";
       };
 
+      cachePath = mkOption {
+        type = types.nullOr types.path;
+        default = null;
+        example = "/home/seed-exporter/cache";
+        description = mdDoc "Directory for caching parsed crawler results (disabled if null).";
+      };
+
       uploadResult = {
         enable = mkEnableOption "upload result";
         ftp = {
@@ -72,6 +79,12 @@ in
             example = "/path/to/result";
             description = mdDoc "FTP server destination path";
           };
+          tlsMinVersion = mkOption {
+            type = types.enum [ "1.2" "1.3" ];
+            default = "1.2";
+            example = "1.3";
+            description = mdDoc "Minimum TLS version for FTP connections.";
+          };
         };
       };
     };
@@ -102,6 +115,9 @@ in
       groups.seed-exporter = { };
     };
 
+    # the exporter expects the cache directory to exist
+    systemd.tmpfiles.rules = optional (cfg.cachePath != null)
+      "d ${cfg.cachePath} 0750 seed-exporter seed-exporter - -";
 
     systemd.timers.seed-exporter = {
       wantedBy = [ "timers.target" ];
@@ -116,12 +132,15 @@ in
       description = "seed-exporter";
       wants = [ "network-online.target" ];
       after = [ "network-online.target" ];
+      # parallel bzip2 decompression of crawler results
+      path = [ pkgs.lbzip2 ];
       serviceConfig = {
         ExecStart = ''${seed-exporter}/bin/seed-exporter \
           --log-level ${cfg.logLevel} \
           --crawler-path ${cfg.crawlerPath} \
           --result-path ${cfg.resultPath} \
-          ${optionalString (cfg.uploadResult.enable != null) "--upload-result --ftp-address ${cfg.uploadResult.ftp.address} --ftp-port ${toString cfg.uploadResult.ftp.port} --ftp-username ${cfg.uploadResult.ftp.username} --ftp-password-file ${cfg.uploadResult.ftp.passwordFile} --ftp-destination ${cfg.uploadResult.ftp.destination} "}
+          ${optionalString (cfg.cachePath != null) "--cache-path ${cfg.cachePath} "}\
+          ${optionalString (cfg.uploadResult.enable != null) "--upload-result --ftp-address ${cfg.uploadResult.ftp.address} --ftp-port ${toString cfg.uploadResult.ftp.port} --ftp-username ${cfg.uploadResult.ftp.username} --ftp-password-file ${cfg.uploadResult.ftp.passwordFile} --ftp-destination ${cfg.uploadResult.ftp.destination} --ftp-tls-min-version ${cfg.uploadResult.ftp.tlsMinVersion} "}
         '';
         ReadWriteDirectories = "/home/seed-exporter/";
         User = "seed-exporter";
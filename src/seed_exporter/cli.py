@@ -1,7 +1,10 @@
 """Command-line interface for the seed exporter."""
 
+import atexit
 import logging as log
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
 
 from seed_exporter.config import get_config
 from seed_exporter.exporter import Exporter
@@ -17,6 +20,14 @@ def main():
         datefmt="%Y-%m-%dT%H:%M:%SZ",
     )
     log.Formatter.converter = time.gmtime
+    # hand log records to a background thread that owns the actual handlers,
+    # so logging does not block on writing to the console
+    root_logger = log.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root_logger.handlers)
+    root_logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
     log.info("Using configuration: %s", conf)
 
     exporter = Exporter(conf)
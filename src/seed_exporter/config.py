@@ -5,12 +5,13 @@ import datetime
 import importlib.metadata
 import os
 from dataclasses import asdict, dataclass, fields
+from functools import cache, cached_property
 from pathlib import Path, PosixPath
 
 __version__ = importlib.metadata.version(__package__ or __name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class ComponentConfig:
     """Base class for components."""
 
@@ -19,8 +20,13 @@ class ComponentConfig:
         return asdict(self)
 
     def __str__(self):
+        """Return string representation."""
+        return self._str
+
+    @cached_property
+    def _str(self) -> str:
         """
-        Return string representation.
+        Build string representation once (configurations are immutable).
         Pretty-print datetime and PosixPath objects.
         """
         parts = []
@@ -35,7 +41,7 @@ class ComponentConfig:
         return ", ".join(parts)
 
 
-@dataclass
+@dataclass(frozen=True)
 class FTPConfig(ComponentConfig):
     """FTP-related settings."""
 
@@ -44,22 +50,24 @@ class FTPConfig(ComponentConfig):
     username: str
     password: str
     destination: Path
+    tls_min_version: str = "1.2"
 
     def __str__(self):
         """Return string representation, ensuring redaction of critital data."""
         return (
             f"FTPConfig(address=***, port={self.port}, username=***, "
-            f"password=***, destination={self.destination})"
+            f"password=***, destination={self.destination}, "
+            f"tls_min_version={self.tls_min_version})"
         )
 
     @staticmethod
     def get_ftp_password(args: argparse.Namespace) -> str:
         """Read FTP password from file."""
         file = Path(args.ftp_password_file)
-        if not file.exists() or not file.is_file():
-            raise ValueError(f"Password file {file} does not exist.")
-        with file.open("r", encoding="UTF-8") as f:
-            return f.read().strip()
+        try:
+            return file.read_text(encoding="UTF-8").strip()
+        except (FileNotFoundError, IsADirectoryError) as e:
+            raise ValueError(f"Password file {file} does not exist.") from e
 
     @classmethod
     def parse(cls, args):
@@ -80,10 +88,11 @@ class FTPConfig(ComponentConfig):
             username=args.ftp_username,
             password=FTPConfig.get_ftp_password(args),
             destination=Path(args.ftp_destination),
+            tls_min_version=args.ftp_tls_min_version,
         )
 
 
-@dataclass
+@dataclass(frozen=True)
 class Config(ComponentConfig):
     """Exporter settings."""
 
@@ -92,6 +101,7 @@ class Config(ComponentConfig):
     log_level: int
     crawler_path: Path
     result_path: Path
+    cache_path: Path | None
     upload: bool
     ftp: FTPConfig
 
@@ -104,20 +114,28 @@ class Config(ComponentConfig):
             raise ValueError(f"--crawler-path {args.crawler_path} does not exist.")
         if not Path(args.result_path).exists():
             raise ValueError(f"--result-path {args.result_path} does not exist.")
+        if args.cache_path and not Path(args.cache_path).exists():
+            raise ValueError(f"--cache-path {args.cache_path} does not exist.")
 
         return cls(
             version=__version__,
-            timestamp=datetime.datetime.utcnow(),
+            # naive UTC timestamp: "Z" suffix is added when formatting
+            timestamp=datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
             log_level=args.log_level.upper(),
             crawler_path=Path(args.crawler_path),
             result_path=Path(args.result_path),
+            cache_path=Path(args.cache_path) if args.cache_path else None,
             upload=args.upload_result,
             ftp=FTPConfig.parse(args),
         )
 
 
-def parse_args():
-    """Parse command-line arguments."""
+@cache
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build command-line argument parser. The parser is only built once and
+    reused for subsequent calls (e.g., when running main() repeatedly).
+    """
 
     parser = argparse.ArgumentParser()
 
@@ -142,6 +160,13 @@ def parse_args():
         help="Directory for results",
     )
 
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        default=None,
+        help="Directory for caching parsed crawler results (default: disabled)",
+    )
+
     parser.add_argument(
         "--upload-result",
         action=argparse.BooleanOptionalAction,
@@ -184,7 +209,21 @@ def parse_args():
         help="FTP server file destination",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--ftp-tls-min-version",
+        type=str,
+        choices=["1.2", "1.3"],
+        default="1.2",
+        help="Minimum TLS version for FTP connections (default: 1.2)",
+    )
+
+    return parser
+
+
+def parse_args():
+    """Parse command-line arguments."""
+
+    args = build_parser().parse_args()
     return args
 
 
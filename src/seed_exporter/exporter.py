@@ -21,11 +21,16 @@ class Exporter:
 
         log.debug("Starting export...")
         log.debug("Reading input data...")
-        input_reader = CrawlerInputReader(self.conf.crawler_path, self.conf.timestamp)
+        input_reader = CrawlerInputReader(
+            self.conf.crawler_path, self.conf.timestamp, self.conf.cache_path
+        )
         df_input = input_reader.get_data()
 
         log.debug("Processing input data...")
         df_stats = DataProcessing.process_data(df_input)
+        # per-node statistics are all that is needed from here on, so release
+        # the (large) input data before formatting and writing results
+        del df_input
 
         log.debug("Writing results...")
         writer = FormattedOutputWriter(self.conf.result_path, self.conf.timestamp)
@@ -2,11 +2,19 @@
 
 import datetime as dt
 import logging as log
+import os
+import shutil
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
+from typing import ClassVar
 
 import pandas as pd
 
+from seed_exporter.config import __version__
 from seed_exporter.input import InputColumns as InCol
 
 
@@ -16,43 +24,196 @@ class CrawlerInputReader:
 
     path: Path
     timestamp: dt.datetime
+    cache_path: Path | None = None
+    # crawler column names differing from InputColumns, renamed at read time
+    CSV_NAMES: ClassVar[dict[str, str]] = {"host": InCol.IP_ADDRESS}
+    # only parse the columns required downstream; numeric columns other than
+    # the port may be empty for nodes with failed handshakes, so they cannot be
+    # integer-typed here
+    CSV_COLUMNS: ClassVar[list[str]] = [
+        "host",
+        InCol.PORT,
+        InCol.NETWORK,
+        InCol.TIMESTAMP,
+        InCol.SERVICES,
+        InCol.BLOCKS,
+        InCol.VERSION,
+        InCol.USER_AGENT,
+        InCol.CONNECTION_TIME,
+        InCol.HANDSHAKE_SUCCESSFUL,
+    ]
+    CSV_DTYPES: ClassVar[dict[str, str]] = {
+        InCol.PORT: "uint16",
+        InCol.HANDSHAKE_SUCCESSFUL: "bool",
+        InCol.USER_AGENT: "str",
+    }
+    # numeric columns that are only empty for nodes with failed handshakes, so
+    # they can be integer-typed once those are dropped; blocks and versions fit
+    # into 32 bits, halving their memory footprint. Since older crawls may
+    # still lack some of these values (only each node's latest metadata needs
+    # to be complete), they use the nullable Int32 type
+    HANDSHAKE_DTYPES: ClassVar[dict[str, str]] = {
+        InCol.SERVICES: "int64",
+        InCol.BLOCKS: "Int32",
+        InCol.VERSION: "Int32",
+    }
+    # multi-threaded bzip2 decompressor, used instead of the single-threaded
+    # stdlib bz2 module if available
+    LBZIP2: ClassVar[str | None] = shutil.which("lbzip2")
 
     def _find_matching_files(self, date_range) -> list[Path]:
-        """Find relevant input files, ensuring data is available for the last 30 days."""
+        """
+        Find relevant input files, ensuring data is available for the last 30 days.
+
+        List the directory only once and group result files by date instead of
+        globbing the directory for each date. Files are returned in
+        chronological order, so the combined data is sorted by timestamp.
+        """
+        files_by_date = defaultdict(list)
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                # filenames look like YYYY-MM-DDTHH-MM-SSZ_reachable_nodes.csv.bz2
+                if entry.name[10:11] == "T" and entry.name.endswith(
+                    "reachable_nodes.csv.bz2"
+                ):
+                    files_by_date[entry.name[:10]].append(Path(entry.path))
+
         matching_files = []
         for date in date_range:
-            files = list(self.path.glob(f"{date}T*reachable_nodes.csv.bz2"))
+            files = files_by_date.get(str(date))
             if not files:
                 raise FileNotFoundError(f"No data found for date: {date}")
             matching_files.extend(files)
-        return matching_files
+        # filenames start with the crawl's timestamp, so they sort chronologically
+        return sorted(matching_files, key=lambda file: file.name)
+
+    @staticmethod
+    def _cache_file(file: Path, cache_path: Path) -> Path:
+        """Get cache file for a crawler result file (tagged with the version)."""
+        stem = file.name.removesuffix(".csv.bz2")
+        return cache_path / f"{stem}-{__version__}.pkl"
+
+    @staticmethod
+    def _load_file(file: Path, threads: int = 1) -> pd.DataFrame:
+        """
+        Load a single crawler result file and tag all rows with the crawl's
+        timestamp (encoded in the filename).
+        """
+        # filename starts with YYYY-MM-DDTHH-MM-SS; slicing is a lot cheaper
+        # than strptime, which reparses the format string on every call
+        name = file.name
+        timestamp = dt.datetime(
+            int(name[0:4]),
+            int(name[5:7]),
+            int(name[8:10]),
+            int(name[11:13]),
+            int(name[14:16]),
+            int(name[17:19]),
+        )
+        df = CrawlerInputReader._read_csv(file, threads)
+        df["timestamp"] = timestamp
+        return df
+
+    @staticmethod
+    def _read_csv(file: Path, threads: int = 1) -> pd.DataFrame:
+        """
+        Decompress and parse a crawler result file, and rename columns to the
+        names used throughout the exporter.
+
+        Decompression is offloaded to lbzip2 if it is installed, using the
+        given number of threads. Files are read by several worker processes
+        at once, so each gets its share of the cores instead of all of them.
+        """
+        kwargs = {
+            "usecols": CrawlerInputReader.CSV_COLUMNS,
+            "dtype": CrawlerInputReader.CSV_DTYPES,
+        }
+        if CrawlerInputReader.LBZIP2 is None:
+            df = pd.read_csv(file, **kwargs)
+        else:
+            cmd = [CrawlerInputReader.LBZIP2, "-dc", "-n", str(threads), str(file)]
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+                df = pd.read_csv(proc.stdout, **kwargs)
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
+        return df.rename(columns=CrawlerInputReader.CSV_NAMES, copy=False)
 
     @staticmethod
     def postprocess_data(df: pd.DataFrame) -> pd.DataFrame:
         """Perform post-processing:
-        1. Ensure DateTimeIndex
-        2. Rename host column to InputColumns.IP_ADDRESS (address)
-        3. Drop nodes who did not complete the handshake
-        4. Fix some columns data types
-        5. Replace missing user-agent data with "(empty)"
+        1. Drop nodes who did not complete the handshake
+        2. Fix some columns data types (see HANDSHAKE_DTYPES)
+        3. Replace missing user-agent data with "(empty)"
         """
 
-        df.index = pd.to_datetime(df.index)
-        df.rename(columns={"host": InCol.IP_ADDRESS}, inplace=True)
-        num_total = len(df)
         # create copy after slicing to avoid pandas SettingWithCopyWarning
         df = df[df[InCol.HANDSHAKE_SUCCESSFUL]].copy()
-        num_valid = len(df)
-        df[InCol.SERVICES] = df[InCol.SERVICES].astype(int)
-        df.loc[df[InCol.USER_AGENT].isnull(), InCol.USER_AGENT] = "(empty)"
-        log.debug(
-            "Dropping %d nodes with failed handshake (original=%d, remaining=%d)",
-            num_total - num_valid,
-            num_total,
-            num_valid,
-        )
+        for col, dtype in CrawlerInputReader.HANDSHAKE_DTYPES.items():
+            df[col] = df[col].astype(dtype)
+        df[InCol.USER_AGENT] = df[InCol.USER_AGENT].fillna("(empty)")
         return df
 
+    @staticmethod
+    def _read_file(
+        file: Path, cache_path: Path | None = None, threads: int = 1
+    ) -> tuple[int, pd.DataFrame]:
+        """
+        Load and post-process a single crawler result file. Post-processing
+        per file means rows of nodes with failed handshakes are dropped before
+        they are concatenated into the combined DataFrame.
+
+        If a cache directory is given, the result is stored there (tagged with
+        the exporter version) and reused on subsequent runs as long as it is
+        newer than the crawler result file, avoiding repeated bz2
+        decompression and CSV parsing. Caching post-processed data means rows
+        of nodes with failed handshakes are not stored.
+
+        Return the number of rows read alongside the post-processed data.
+
+        Runs in a worker process, so refrain from logging here.
+        """
+        cache_file = None
+        if cache_path is not None:
+            cache_file = CrawlerInputReader._cache_file(file, cache_path)
+            if (
+                cache_file.exists()
+                and cache_file.stat().st_mtime >= file.stat().st_mtime
+            ):
+                return pd.read_pickle(cache_file)
+
+        df = CrawlerInputReader._load_file(file, threads)
+        df_valid = CrawlerInputReader.postprocess_data(df).set_index("timestamp")
+        result = len(df), df_valid
+
+        if cache_file is not None:
+            # write to temporary file first so an interrupted run cannot leave
+            # a truncated cache file behind
+            tmp_file = cache_file.with_suffix(".tmp")
+            pd.to_pickle(result, tmp_file)
+            tmp_file.replace(cache_file)
+        return result
+
+    def _prune_cache(self, files: list[Path]):
+        """
+        Remove cache files that are not needed for the given crawler result
+        files anymore, i.e., files of crawls that dropped out of the 30-day
+        window, files created by other exporter versions, and temporary files
+        left behind by interrupted runs.
+        """
+        assert self.cache_path is not None, "cache is disabled"
+        needed = {self._cache_file(file, self.cache_path).name for file in files}
+        num_removed = 0
+        with os.scandir(self.cache_path) as entries:
+            for entry in entries:
+                if (
+                    "_reachable_nodes-" in entry.name
+                    and entry.name.endswith((".pkl", ".tmp"))
+                    and entry.name not in needed
+                ):
+                    os.remove(entry.path)
+                    num_removed += 1
+        log.debug("Removed %d outdated cache files", num_removed)
+
     def get_data(self) -> pd.DataFrame:
         """Read input files and return a combined DataFrame."""
 
@@ -60,25 +221,53 @@ class CrawlerInputReader:
         date_range = [current_day - dt.timedelta(days=i) for i in range(30)]
         files = self._find_matching_files(date_range)
         log.info("Reading input from %s crawler result files...", len(files))
-        log.debug("Input files: %s", [f.name for f in files])
+        # avoid building debug-only arguments unless they are actually logged
+        debug = log.getLogger().isEnabledFor(log.DEBUG)
+        if debug:
+            log.debug("Input files: %s", [f.name for f in files])
 
         time_start = dt.datetime.now()
-        data_frames = []
-        for file in files:
-            timestamp_str = file.name.split("Z_")[0]
-            timestamp = dt.datetime.strptime(timestamp_str, "%Y-%m-%dT%H-%M-%S")
-            df = pd.read_csv(file)
-            log.debug("Read %s rows from %s", len(df), file)
-            df["timestamp"] = timestamp
-            data_frames.append(df)
-        combined_df = pd.concat(data_frames).set_index("timestamp")
-        result = CrawlerInputReader.postprocess_data(combined_df)
+        # decompressing and parsing is CPU-bound, so spread files across cores;
+        # split the cores among workers so lbzip2 does not oversubscribe them
+        num_cpus = os.cpu_count() or 1
+        max_workers = max(1, min(num_cpus, len(files)))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            read_file = partial(
+                CrawlerInputReader._read_file,
+                cache_path=self.cache_path,
+                threads=max(1, num_cpus // max_workers),
+            )
+            file_results = list(executor.map(read_file, files))
+        if self.cache_path is not None:
+            self._prune_cache(files)
+        if debug:
+            for file, (num_rows, _) in zip(files, file_results):
+                log.debug("Read %s rows from %s", num_rows, file)
+        num_total = sum(num_rows for num_rows, _ in file_results)
+        # frames are indexed per file so concatenating them is the only copy;
+        # release per-file frames right away to keep peak memory down
+        result = pd.concat([df for _, df in file_results])
+        del file_results
+        # few distinct values are repeated across nodes and crawls, so store
+        # them as categoricals (version stays numeric for comparisons); for
+        # addresses, this also makes grouping by node considerably faster
+        for col in (InCol.IP_ADDRESS, InCol.NETWORK, InCol.USER_AGENT):
+            result[col] = result[col].astype("category")
+        log.debug(
+            "Dropped %d nodes with failed handshake (original=%d, remaining=%d)",
+            num_total - len(result),
+            num_total,
+            len(result),
+        )
 
         elapsed = dt.datetime.now() - time_start
-        unique_nodes = result.drop_duplicates(subset=["address", "port"])
+        # count address-port pairs without materializing a deduplicated frame
+        num_nodes = result.groupby(
+            [InCol.IP_ADDRESS, InCol.PORT], sort=False, observed=True
+        ).ngroups
         log.info(
             "Extracted %d unique nodes from %d rows in %d files in %.2fs",
-            len(unique_nodes),
+            num_nodes,
             len(result),
             len(files),
             elapsed.total_seconds(),
@@ -28,6 +28,36 @@ class OutCol:
     USER_AGENT: ClassVar[str] = "useragent"
 
 
+def format_socket_address(df: pd.DataFrame) -> pd.Series:
+    """Combine address and port columns, surrounding IPv6 addresses with brackets."""
+    address = df[InCol.IP_ADDRESS].astype(str)
+    port = df[InCol.PORT].astype(str)
+    is_ipv6 = address.str.contains(":", regex=False)
+    return address.where(~is_ipv6, "[" + address + "]") + ":" + port
+
+
+def format_int(col: pd.Series) -> pd.Series:
+    """Format column as integers."""
+    return col.astype(int).astype(str)
+
+
+def format_percentage(col: pd.Series) -> pd.Series:
+    """Format column as percentage with two decimals (equivalent to f"{x:.2%}")."""
+    # printf-style formatting is faster than both str.format and np.char.mod
+    return (col * 100).map("%.2f%%".__mod__)
+
+
+def format_hex(col: pd.Series) -> pd.Series:
+    """Format column as zero-padded, eight-digit hex value."""
+    # printf-style formatting is faster than both str.format and np.char.mod
+    return col.astype(int).map("%08x".__mod__)
+
+
+def format_quoted(col: pd.Series) -> pd.Series:
+    """Surround column values with double quotes."""
+    return '"' + col.astype(str) + '"'
+
+
 @dataclass
 class ColFmt:
 
@@ -35,29 +65,20 @@ class ColFmt:
     Class representing an column format for output columns.
 
     name: name of the column in the output file
-    alignment: < or > for left or right alignment
-    max_width: maximum width of the column
-
-    Columns can either:
-    - come from a column by another name
-      - sometimes without any transformation
-      - sometimes with a type cast
-      - sometimes with a transformation (float to % string, string to quote-surrounded-string, hex-value)
-    - be constructed from multiple columns
-
-    Figure out how to cover all of these as simply as possible.
+    input: name of the input column, or list of input column names
+    formatter: vectorized function converting the input column (a Series, or
+      a DataFrame if multiple input columns are used) into a Series of strings
+    align: < or > for left or right alignment
     """
 
     name: str
     input: str | List[str]
-    formatter: Callable
+    formatter: Callable[[pd.Series | pd.DataFrame], pd.Series]
     align: str = ">"
 
-    def format(self, df: pd.DataFrame):
+    def format(self, df: pd.DataFrame) -> pd.Series:
         """Format the column in the dataframe."""
-        if isinstance(self.input, str):
-            return df[self.input].apply(self.formatter)
-        return df.apply(lambda row: self.formatter(row[self.input]), axis=1)
+        return self.formatter(df[self.input])
 
 
 @dataclass(frozen=True)
@@ -68,31 +89,31 @@ class ColumnFormatter:
         ColFmt(
             OutCol.SOCKET_ADDRESS,
             [InCol.IP_ADDRESS, InCol.PORT],
-            formatter=(
-                lambda x: f"[{x.iloc[0]}]:{x.iloc[1]}"
-                if ":" in x.iloc[0]
-                else f"{x.iloc[0]}:{x.iloc[1]}"
-            ),
+            formatter=format_socket_address,
             align="<",
         ),
-        ColFmt(OutCol.GOOD, StatCol.GOOD, lambda x: f"{int(x)}"),
-        ColFmt(OutCol.TIMESTAMP, InCol.TIMESTAMP, lambda x: f"{int(x)}"),
-        ColFmt(OutCol.AVAILABILITY_2H, StatCol.AVAILABILITY_2H, lambda x: f"{x:.2%}"),
-        ColFmt(OutCol.AVAILABILITY_8H, StatCol.AVAILABILITY_8H, lambda x: f"{x:.2%}"),
-        ColFmt(OutCol.AVAILABILITY_1D, StatCol.AVAILABILITY_1D, lambda x: f"{x:.2%}"),
-        ColFmt(OutCol.AVAILABILITY_7D, StatCol.AVAILABILITY_7D, lambda x: f"{x:.2%}"),
-        ColFmt(OutCol.AVAILABILITY_30D, StatCol.AVAILABILITY_30D, lambda x: f"{x:.2%}"),
-        ColFmt(OutCol.BLOCKS, InCol.BLOCKS, lambda x: f"{int(x)}"),
-        ColFmt(OutCol.SERVICES, InCol.SERVICES, lambda x: f"{int(x):08x}"),
-        ColFmt(OutCol.VERSION, InCol.VERSION, lambda x: f"{int(x)}"),
-        ColFmt(OutCol.USER_AGENT, InCol.USER_AGENT, lambda x: f'"{x}"', align="<"),
+        ColFmt(OutCol.GOOD, StatCol.GOOD, format_int),
+        ColFmt(OutCol.TIMESTAMP, InCol.TIMESTAMP, format_int),
+        ColFmt(OutCol.AVAILABILITY_2H, StatCol.AVAILABILITY_2H, format_percentage),
+        ColFmt(OutCol.AVAILABILITY_8H, StatCol.AVAILABILITY_8H, format_percentage),
+        ColFmt(OutCol.AVAILABILITY_1D, StatCol.AVAILABILITY_1D, format_percentage),
+        ColFmt(OutCol.AVAILABILITY_7D, StatCol.AVAILABILITY_7D, format_percentage),
+        ColFmt(OutCol.AVAILABILITY_30D, StatCol.AVAILABILITY_30D, format_percentage),
+        ColFmt(OutCol.BLOCKS, InCol.BLOCKS, format_int),
+        ColFmt(OutCol.SERVICES, InCol.SERVICES, format_hex),
+        ColFmt(OutCol.VERSION, InCol.VERSION, format_int),
+        ColFmt(OutCol.USER_AGENT, InCol.USER_AGENT, format_quoted, align="<"),
     ]
 
     @staticmethod
-    def format(df: pd.DataFrame) -> pd.DataFrame:
-        """Get formatted columns, concatenated them and return dataframe."""
+    def format(df: pd.DataFrame) -> dict[str, pd.Series]:
+        """
+        Get formatted columns and return them in output order, keyed by output
+        column name. Columns are not combined into a dataframe, since writers
+        only need to iterate over them.
+        """
         formatted_cols = {}
         for col in ColumnFormatter.COLUMNS:
             log.debug("Formatting column %s", col.name)
             formatted_cols[col.name] = col.format(df)
-        return pd.DataFrame(formatted_cols)
+        return formatted_cols
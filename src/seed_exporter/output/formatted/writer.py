@@ -5,6 +5,7 @@ import gzip
 import logging as log
 import socket
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import ClassVar
 
@@ -23,31 +24,46 @@ class FormattedOutputWriter:
     path: Path
     timestamp: dt.datetime
     SORT_KEY: ClassVar[str] = StatsColumns.AVAILABILITY_30D
+    # gzip's default level: much faster than Python's default (9) while
+    # output is only marginally larger
+    COMPRESS_LEVEL: ClassVar[int] = 6
+    # alignment only depends on the column definitions, so derive it once
+    ALIGN_MAP: ClassVar[dict[str, str]] = {
+        col.name: col.align for col in ColumnFormatter.COLUMNS
+    }
+
+    @cached_property
+    def filename(self) -> Path:
+        """Output filename, derived from the writer's timestamp."""
+        return self.path / f"seeds-{self.timestamp:%Y-%m-%dT%H-%M-%SZ}.txt.gz"
 
     def write(self, df: pd.DataFrame) -> Path:
         """Sort columns, apply formatting and write results."""
         # sort key might no longer be a number after formatting, so sort first
         df_sorted = df.sort_values(by=self.SORT_KEY, ascending=False)
-        df_formatted = ColumnFormatter.format(df_sorted)
-        timestamp_str = dt.datetime.strftime(self.timestamp, "%Y-%m-%dT%H-%M-%SZ")
-        filename = self.path / f"seeds-{timestamp_str}.txt.gz"
-        self._write_formatted_gz(df_formatted, filename, self.timestamp)
-        log.info("Wrote %d rows to %s", len(df_formatted), filename)
-        return filename
+        formatted_cols = ColumnFormatter.format(df_sorted)
+        self._write_formatted_gz(formatted_cols, self.filename, self.timestamp)
+        log.info("Wrote %d rows to %s", len(df_sorted), self.filename)
+        return self.filename
 
     @staticmethod
-    def _write_formatted_gz(df: pd.DataFrame, filename: Path, timestamp: dt.datetime):
+    def _write_formatted_gz(
+        cols: dict[str, pd.Series], filename: Path, timestamp: dt.datetime
+    ):
         """
-        Write formatted data to file.
+        Write formatted columns (keyed by column name, in output order) to file.
 
         Determine column alignments and widths (max of length of all entries and
-        the column name). Write header (with prefix) and rows.
+        the column name). Write header (with prefix) and stream rows to the
+        file using a row format string built once from these alignments and
+        widths.
         """
-        col_align = {col.name: col.align for col in ColumnFormatter.COLUMNS}
+        col_align = FormattedOutputWriter.ALIGN_MAP
+        # columns are already strings after formatting
         col_width = {
-            col: max(df[col].astype(str).apply(len).max(), len(col))
-            for col in df.columns
+            col: max(val.str.len().max(), len(col)) for col, val in cols.items()
         }
+        first_col = next(iter(cols))
 
         run_info = (
             f"# created by {socket.gethostname()} "
@@ -59,19 +75,27 @@ class FormattedOutputWriter:
         header = (
             header_prefix
             + " ".join(
-                f"{col:{col_align[col]}{col_width[col] - (len(header_prefix) if col == df.columns[0] else 0)}}"
-                for col in df.columns
+                f"{col:{col_align[col]}{col_width[col] - (len(header_prefix) if col == first_col else 0)}}"
+                for col in cols
             ).rstrip()
         )
 
-        formatted_rows = [
-            " ".join(
-                f"{str(row[col]):{col_align[col]}{col_width[col]}}"
-                for col in df.columns
-            ).rstrip()
-            for _, row in df.iterrows()
-        ]
-        output = "\n".join([run_info] + [header] + formatted_rows) + "\n"
+        # printf-style template, e.g. "%-40s %4s", applied to every row; this
+        # is considerably faster than str.format with per-field format specs
+        row_fmt = " ".join(
+            f"%{'-' if col_align[col] == '<' else ''}{col_width[col]}s" for col in cols
+        )
 
-        with gzip.open(filename, "wb") as file:
-            file.write(output.encode("utf-8"))
+        with gzip.open(
+            filename,
+            "wt",
+            compresslevel=FormattedOutputWriter.COMPRESS_LEVEL,
+            encoding="utf-8",
+            newline="\n",
+        ) as file:
+            file.write(run_info + "\n")
+            file.write(header + "\n")
+            file.writelines(
+                (row_fmt % row).rstrip() + "\n"
+                for row in zip(*(val.tolist() for val in cols.values()))
+            )
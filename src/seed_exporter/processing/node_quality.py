@@ -3,8 +3,10 @@
 import logging as log
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import partial
 from typing import ClassVar
 
+import numpy as np
 import pandas as pd
 
 from seed_exporter.input import InputColumns as InCol
@@ -23,22 +25,21 @@ class NodeQuality:
         "regular": 5 * 1000 * 0.5,  # 5s - 50% (prefer responsive nodes)
         "socks5": 20 * 1000 * 1.2,  # 20s + 20% (address performance fluctuations)
     }
-    STATS: ClassVar[defaultdict] = defaultdict(lambda: defaultdict(lambda: 0))
 
     @staticmethod
-    def considered_reliable(row: pd.DataFrame) -> bool:
-        """Evaluate if the node is considered reliable."""
+    def considered_reliable(df: pd.DataFrame) -> pd.Series:
+        """Evaluate if nodes are considered reliable."""
 
-        def was_reliable(window: str, share: float, count: int):
-            """Check if the node has been reliable in the given time window."""
-            return row[window] > share and row[StatsColumns.count(window)] > count
+        def was_reliable(window: str, share: float, count: int) -> pd.Series:
+            """Check if nodes have been reliable in the given time window."""
+            return (df[window] > share) & (df[StatsColumns.count(window)] > count)
 
         return (
             was_reliable(StatsColumns.AVAILABILITY_2H, 0.85, 2)
-            or was_reliable(StatsColumns.AVAILABILITY_8H, 0.70, 4)
-            or was_reliable(StatsColumns.AVAILABILITY_1D, 0.55, 8)
-            or was_reliable(StatsColumns.AVAILABILITY_7D, 0.45, 16)
-            or was_reliable(StatsColumns.AVAILABILITY_30D, 0.35, 32)
+            | was_reliable(StatsColumns.AVAILABILITY_8H, 0.70, 4)
+            | was_reliable(StatsColumns.AVAILABILITY_1D, 0.55, 8)
+            | was_reliable(StatsColumns.AVAILABILITY_7D, 0.45, 16)
+            | was_reliable(StatsColumns.AVAILABILITY_30D, 0.35, 32)
         )
 
     @staticmethod
@@ -53,83 +54,89 @@ class NodeQuality:
         return df[InCol.BLOCKS].median() - 100 * 24 * 6
 
     @staticmethod
-    def uses_standard_port(row: pd.DataFrame) -> bool:
+    def uses_standard_port(df: pd.DataFrame) -> pd.Series:
         """
-        Determine if node uses default port (8333 for all network types except
+        Determine if nodes use default port (8333 for all network types except
         I2P, which uses dummy port 0).
         """
-        if row[InCol.NETWORK] != "i2p" and row[InCol.PORT] == NodeQuality.DEFAULT_PORT:
-            return True
-        if row[InCol.NETWORK] == "i2p" and row[InCol.PORT] == 0:
-            return True
-        return False
+        is_i2p = df[InCol.NETWORK] == "i2p"
+        return (~is_i2p & (df[InCol.PORT] == NodeQuality.DEFAULT_PORT)) | (
+            is_i2p & (df[InCol.PORT] == 0)
+        )
 
     @staticmethod
-    def exceeds_timeouts(row: pd.DataFrame) -> bool:
+    def exceeds_timeouts(df: pd.DataFrame) -> pd.Series:
         """
-        Determine if node exceeds connection timeouts (see NodeQuality.CONNECTION_TIMEOUTS).
+        Determine if nodes exceed connection timeouts (see NodeQuality.CONNECTION_TIMEOUTS).
         """
-        if row[InCol.NETWORK] in ("onion_v3", "i2p"):
-            if row[InCol.CONNECTION_TIME] < NodeQuality.CONNECTION_TIMEOUTS["socks5"]:
-                return False
-        if row[InCol.CONNECTION_TIME] < NodeQuality.CONNECTION_TIMEOUTS["regular"]:
-            return False
-        return True
+        uses_socks5 = df[InCol.NETWORK].isin(["onion_v3", "i2p"])
+        connection_time = df[InCol.CONNECTION_TIME]
+        within_timeout = (
+            uses_socks5 & (connection_time < NodeQuality.CONNECTION_TIMEOUTS["socks5"])
+        ) | (connection_time < NodeQuality.CONNECTION_TIMEOUTS["regular"])
+        return ~within_timeout
 
     @staticmethod
-    def evaluate(df: pd.DataFrame) -> pd.Series:
+    def update_statistics(
+        stats: defaultdict,
+        networks: pd.Index,
+        network_codes: np.ndarray,
+        mask: pd.Series,
+        key: str,
+    ):
         """
-        Evaluate node quality: good vs. bad.
+        Add number of nodes matching mask per network to statistics.
 
-        Inspired by https://github.com/sipa/bitcoin-seeder/blob/ff482e465ff84ea6fa276d858ccb7ef32e3355d3/db.h#L104-L119.
+        Networks are given as factorized codes (see pd.factorize), so nodes
+        can be counted for all networks in a single bincount pass.
         """
+        counts = np.bincount(network_codes[mask.to_numpy()], minlength=len(networks))
+        for network, count in zip(networks, counts):
+            stats[network][key] += int(count)
 
-        def evaluate_node(row: pd.DataFrame) -> bool:
-            """Evaluate node quality for a single node/row."""
-
-            NodeQuality.STATS[row[InCol.NETWORK]]["total"] += 1
-
-            if not NodeQuality.uses_standard_port(row):
-                NodeQuality.STATS[row[InCol.NETWORK]]["port"] += 1
-                return False
-
-            if not row[InCol.SERVICES] & NodeQuality.NODE_NETWORK:
-                NodeQuality.STATS[row[InCol.NETWORK]]["services"] += 1
-                return False
-
-            if row[InCol.VERSION] < NodeQuality.VERSION_THRESHOLD:
-                NodeQuality.STATS[row[InCol.NETWORK]]["version"] += 1
-                return False
+    @staticmethod
+    def evaluate(df: pd.DataFrame) -> pd.Series:
+        """
+        Evaluate node quality: good vs. bad.
 
-            if row[InCol.BLOCKS] < NodeQuality.get_block_threshold(df):
-                NodeQuality.STATS[row[InCol.NETWORK]]["blocks"] += 1
-                return False
+        Inspired by https://github.com/sipa/bitcoin-seeder/blob/ff482e465ff84ea6fa276d858ccb7ef32e3355d3/db.h#L104-L119.
 
-            if NodeQuality.exceeds_timeouts(row):
-                NodeQuality.STATS[row[InCol.NETWORK]]["timeout"] += 1
-                return False
+        All checks are evaluated on entire columns. Checks are applied in
+        order; for the evaluation statistics, a bad node is attributed to the
+        first check it failed. Statistics are collected per call, so repeated
+        evaluations do not accumulate into each other.
+        """
 
+        checks = {
+            "port": NodeQuality.uses_standard_port(df),
+            "services": (df[InCol.SERVICES] & NodeQuality.NODE_NETWORK) != 0,
+            "version": df[InCol.VERSION] >= NodeQuality.VERSION_THRESHOLD,
+            "blocks": df[InCol.BLOCKS] >= NodeQuality.get_block_threshold(df),
+            "timeout": ~NodeQuality.exceeds_timeouts(df),
             # Not sure about this. We wouldn't want to allow a node we've
             # observed only a couple of times even it was reachable more than
             # half of the time if that was a month ago
             # if not (total <= 3 && success * 2 >= total)
             #     return False
+            "reliability": NodeQuality.considered_reliable(df),
+        }
 
-            if not NodeQuality.considered_reliable(row):
-                NodeQuality.STATS[row[InCol.NETWORK]]["reliability"] += 1
-                return False
-
-            NodeQuality.STATS[row[InCol.NETWORK]]["good"] += 1
-            return True
-
-        good_col = df.apply(evaluate_node, axis=1)
+        stats = defaultdict(lambda: defaultdict(lambda: 0))
+        network_codes, networks = pd.factorize(df[InCol.NETWORK])
+        update = partial(NodeQuality.update_statistics, stats, networks, network_codes)
+        good_col = pd.Series(True, index=df.index)
+        update(good_col, "total")
+        for check, passed in checks.items():
+            update(good_col & ~passed, check)
+            good_col &= passed
+        update(good_col, "good")
 
-        NodeQuality.log_statistics()
+        NodeQuality.log_statistics(stats)
 
         return good_col
 
     @staticmethod
-    def log_statistics():
+    def log_statistics(statistics: defaultdict):
         """Log node evaluation statistics."""
 
         def log_aligned(fmt, *args):
@@ -160,7 +167,7 @@ class NodeQuality:
         log.info("Evaluation statistics:")
         log_aligned(fmt, *cols)
         for net_type in ["ipv4", "ipv6", "onion_v3", "i2p", "cjdns"]:
-            stats = NodeQuality.STATS[net_type]
+            stats = statistics[net_type]
             good_share = stats["good"] / stats["total"] if stats["total"] > 0 else 0
             good_share = f"{good_share:.1%}"
             log_aligned(
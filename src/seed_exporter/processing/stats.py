@@ -3,7 +3,10 @@
 import datetime as dt
 import logging as log
 from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
 
+import numpy as np
 import pandas as pd
 
 from seed_exporter.input import InputColumns as InCol
@@ -29,34 +32,54 @@ class DataProcessing:
 
     @staticmethod
     def compute_availability_shares(
-        df: pd.DataFrame, window_name: str, window_delta: dt.timedelta
+        df: pd.DataFrame, windows: dict[str, dt.timedelta]
     ) -> pd.DataFrame:
         """
-        Calculate availability share for each node (address-port pair) in the given time window.
-
-        Begin by filtering the dataframe to only include entries within the
-        given time window; exit early if window is empty. Next, group the
-        filtered dataframe by node and count the number of timestamps each node
-        appears in. Then, derive share.
+        Calculate availability shares for each node (address-port pair) in all
+        given time windows.
+
+        All windows end at the most recent timestamp. Since the index is
+        sorted, each window is a trailing slice of the entries whose start is
+        found by binary search. Begin by flagging the entries within each
+        window. Next, group by node once and sum up the flags to count the
+        number of timestamps each node appears in per window. Then, derive
+        shares by dividing by the number of distinct timestamps in each window.
+
+        Expects the dataframe to be indexed by a sorted DatetimeIndex. The
+        result is indexed by node.
         """
 
-        df.index = pd.to_datetime(df.index)
-        end_time = df.index.max()
+        assert df.index.is_monotonic_increasing, "index must be sorted"
+        end_time = df.index[-1]
         assert isinstance(end_time, pd.Timestamp), "end_time must be a pd.Timestamp"
-        start_time = end_time - window_delta
-        filtered_df = df[(df.index >= start_time) & (df.index <= end_time)]
-        if filtered_df.empty:
-            return pd.DataFrame(columns=[InCol.IP_ADDRESS, InCol.PORT, window_name])
 
-        total_timestamps = filtered_df.index.nunique()
+        positions = pd.RangeIndex(len(df))
+        # sort-based np.unique is cheaper than the hash-based Index.unique here,
+        # and its result is sorted, too
+        distinct_timestamps = np.unique(df.index.to_numpy())
+        # use the underlying arrays, so categorical addresses stay categorical
+        in_window = {
+            InCol.IP_ADDRESS: df[InCol.IP_ADDRESS].array,
+            InCol.PORT: df[InCol.PORT].array,
+        }
+        total_timestamps = {}
+        for window_name, window_delta in windows.items():
+            start_time = end_time - window_delta
+            start = df.index.searchsorted(start_time)
+            in_window[StatsColumns.count(window_name)] = positions >= start
+            first_distinct = distinct_timestamps.searchsorted(
+                start_time.to_datetime64()
+            )
+            total_timestamps[window_name] = len(distinct_timestamps) - first_distinct
+
         grouped = (
-            filtered_df.groupby([InCol.IP_ADDRESS, InCol.PORT])
-            .size()
-            .to_frame(window_name + "_count")
-            .reset_index()
+            pd.DataFrame(in_window)
+            .groupby([InCol.IP_ADDRESS, InCol.PORT], observed=True)
+            .sum()
         )
 
-        grouped[window_name] = grouped[window_name + "_count"] / total_timestamps
+        for window_name, total in total_timestamps.items():
+            grouped[window_name] = grouped[StatsColumns.count(window_name)] / total
         return grouped
 
     @staticmethod
@@ -64,10 +87,16 @@ class DataProcessing:
         """
         Get most recent metadata for each node (address-port pair).
 
-        The most recent data for each node is obtained by grouping by node and
-        selecting the last entry.
+        Expects entries sorted by time (see process_data) and keeps the last
+        entry of each node, which avoids building groups. The result is
+        indexed by node.
         """
-        df_meta = df.groupby([InCol.IP_ADDRESS, InCol.PORT]).nth(-1).reset_index()
+        assert df.index.is_monotonic_increasing, "index must be sorted"
+        df_meta = (
+            df.drop_duplicates(subset=[InCol.IP_ADDRESS, InCol.PORT], keep="last")
+            .reset_index()
+            .set_index([InCol.IP_ADDRESS, InCol.PORT])
+        )
         return df_meta
 
     @staticmethod
@@ -84,36 +113,37 @@ class DataProcessing:
             StatsColumns.AVAILABILITY_30D: dt.timedelta(days=30),
         }
 
+        # ensure sorted DatetimeIndex once for all downstream computations
+        df_input.index = pd.to_datetime(df_input.index)
+        if not df_input.index.is_monotonic_increasing:
+            df_input = df_input.sort_index(kind="stable")
+
         log.debug("Computing node availability shares for different time windows")
-        results = pd.DataFrame(columns=[InCol.IP_ADDRESS, InCol.PORT])
-        for window_name, window_size in windows.items():
-            log.debug("Processing window: %s", window_name)
-            window_result = DataProcessing.compute_availability_shares(
-                df_input, window_name, window_size
-            )
-            results = pd.merge(
-                results, window_result, on=[InCol.IP_ADDRESS, InCol.PORT], how="outer"
-            )
+        results = DataProcessing.compute_availability_shares(df_input, windows)
 
         log.debug("Extracting metadata...")
         metadata = DataProcessing.get_metadata(df_input)
-        results = pd.merge(
-            results, metadata, on=[InCol.IP_ADDRESS, InCol.PORT], how="outer"
-        )
-
-        log.debug("Filling in missing availability values...")
-        share_cols = list(windows.keys()) + [col + "_count" for col in windows]
-        results[share_cols] = results[share_cols].fillna(0)
+        # both frames are indexed by node, so align them in a single pass
+        results = pd.concat([results, metadata], axis=1).reset_index()
 
         log.debug("Ensuring no data is missing...")
-        nan_rows = results[results.isna().any(axis=1)]
-        if not nan_rows.empty:
-            error_str = f"Missing metadata in {len(nan_rows)} row(s):"
-            for _, row in nan_rows.iterrows():
-                nan_columns = row.index[row.isna()].tolist()
-                address, port = row[InCol.IP_ADDRESS], row[InCol.PORT]
-                error_str += f"\n{address}:{port}: {nan_columns}"
+        nan_mask = results.isna().to_numpy()
+        if nan_mask.any():
+            # row-major order, so (row, column) pairs are already grouped by row
+            rows, cols = np.nonzero(nan_mask)
+            addresses = results[InCol.IP_ADDRESS].to_numpy()
+            ports = results[InCol.PORT].to_numpy()
+            nan_rows = []
+            for row, entries in groupby(
+                zip(rows, results.columns[cols]), key=itemgetter(0)
+            ):
+                nan_columns = [col for _, col in entries]
+                nan_rows.append(f"{addresses[row]}:{ports[row]}: {nan_columns}")
+            error_str = f"Missing metadata in {len(nan_rows)} row(s):\n"
+            error_str += "\n".join(nan_rows)
             raise ValueError(f"Missing (meta)data: {error_str}")
+        # no values are missing, so nullable integer columns can be narrowed
+        results = results.astype({InCol.BLOCKS: "int32", InCol.VERSION: "int32"})
 
         log.debug("Evaluating node quality...")
         results[StatsColumns.GOOD] = NodeQuality.evaluate(results)
@@ -1,40 +1,177 @@
 """Module to upload a file via FTP."""
 
 import logging as log
-from dataclasses import dataclass
-from ftplib import FTP_TLS
+import socket
+import ssl
+import stat
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from ftplib import FTP_TLS, Error, error_temp
 from pathlib import Path
+from typing import ClassVar
 
 from seed_exporter.config import FTPConfig
 
 
 @dataclass
 class FtpUploader:
-    """FTP Uploader class."""
+    """
+    FTP Uploader class.
+
+    Used as a context manager, a single connection is kept open and reused
+    for all uploads; otherwise, each upload uses its own connection.
+    """
 
     conf: FTPConfig
+    _ftp: FTP_TLS | None = field(default=None, init=False, repr=False)
+    TLS_VERSIONS: ClassVar[dict[str, ssl.TLSVersion]] = {
+        "1.2": ssl.TLSVersion.TLSv1_2,
+        "1.3": ssl.TLSVersion.TLSv1_3,
+    }
+    # errors that may go away when trying again (4xx replies, network and TLS
+    # errors, connections closed by the server); other FTP errors (e.g., 5xx
+    # replies such as failed logins) and local errors (e.g., the file cannot
+    # be read) are permanent, so OSError as a whole must not be listed here
+    TRANSIENT_ERRORS: ClassVar[tuple[type[Exception], ...]] = (
+        error_temp,
+        ConnectionError,
+        TimeoutError,
+        ssl.SSLError,
+        socket.gaierror,
+        EOFError,
+    )
+    MAX_ATTEMPTS: ClassVar[int] = 3
+    MAX_RETRY_DELAY: ClassVar[int] = 30
+
+    @cached_property
+    def ssl_context(self) -> ssl.SSLContext:
+        """
+        TLS context shared by all connections of this uploader, so it is only
+        set up once.
+
+        Like ftplib's default context, server certificates are not verified.
+        TLS 1.3 (one round trip less during the handshake) is used if the
+        server supports it; older versions can be ruled out via the
+        configured minimum version.
+        """
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        context.minimum_version = self.TLS_VERSIONS[self.conf.tls_min_version]
+        return context
+
+    def connect(self):
+        """
+        Connect and log in to the FTP server, and change to the destination
+        directory. Changing directories only once is required when reusing
+        the connection, since the destination directory may be relative.
+        """
+        ftp = FTP_TLS(context=self.ssl_context)
+        try:
+            ftp.connect(self.conf.address, self.conf.port)
+            ftp.login(self.conf.username, self.conf.password)
+            ftp.cwd(str(self.conf.destination.parent))
+        except BaseException:
+            ftp.close()
+            raise
+        self._ftp = ftp
+
+    def close(self):
+        """
+        Log out and close the connection to the FTP server, if any.
+
+        Errors while logging out are ignored: the connection is closed either
+        way, and after an aborted transfer the server's pending reply (e.g.,
+        426) makes QUIT fail.
+        """
+        if self._ftp is None:
+            return
+        try:
+            self._ftp.quit()
+        except (Error, OSError, EOFError):
+            pass
+        finally:
+            self._ftp.close()
+            self._ftp = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _store(self, src: Path):
+        """
+        Store file at the configured destination using the open connection.
+
+        Equivalent to ftplib's storbinary, except that the file is sent with
+        sendfile(2), letting the kernel copy it to the socket without passing
+        it through user space. FTP_TLS only encrypts the data connection after
+        PROT P, which is not requested, so the data connection is a plain
+        socket.
+        """
+        assert self._ftp is not None, "not connected"
+        with src.open("rb") as file:
+            self._ftp.voidcmd("TYPE I")
+            with self._ftp.transfercmd(f"STOR {self.conf.destination.name}") as conn:
+                conn.sendfile(file)
+            self._ftp.voidresp()
 
     def upload_file(self, src: Path):
         """Uploads a file to an FTP server."""
-        if not src.exists() or not src.is_file():
+        # a single stat call both checks the file and provides its size
+        try:
+            src_stat = src.stat()
+        except OSError:
+            src_stat = None
+        if src_stat is None or not stat.S_ISREG(src_stat.st_mode):
             log.error("File %s does not exist or is not a file.", src.name)
             return False
 
-        try:
-            with FTP_TLS() as ftp:
-                ftp.connect(self.conf.address, self.conf.port)
-                ftp.login(self.conf.username, self.conf.password)
-                with src.open("rb") as file:
-                    ftp.cwd(str(self.conf.destination.parent))
-                    ftp.storbinary(f"STOR {self.conf.destination.name}", file)
-                ftp.quit()
-            log.info(
-                "Uploaded %s to ftp://<redacted>/%s (%.1fkB uploaded)",
-                str(src),
-                str(self.conf.destination),
-                src.stat().st_size / 1024,
-            )
-            return True
-        except Exception as e:  # pylint: disable=broad-except
-            log.error("Failed to upload file %s: %s", src.name, e)
-            return False
+        persistent = self._ftp is not None
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                if not persistent:
+                    with self:
+                        self._store(src)
+                else:
+                    # reconnect if a previous attempt dropped the connection
+                    if self._ftp is None:
+                        self.connect()
+                    self._store(src)
+                break
+            except self.TRANSIENT_ERRORS as e:
+                if persistent:
+                    # connection state is unknown after an error
+                    self.close()
+                if attempt == self.MAX_ATTEMPTS:
+                    log.error(
+                        "Failed to upload file %s after %d attempts: %s",
+                        src.name,
+                        attempt,
+                        e,
+                    )
+                    return False
+                delay = min(2**attempt, self.MAX_RETRY_DELAY)
+                log.warning(
+                    "Failed to upload file %s (attempt %d/%d): %s; retrying in %ds",
+                    src.name,
+                    attempt,
+                    self.MAX_ATTEMPTS,
+                    e,
+                    delay,
+                )
+                time.sleep(delay)
+            except (Error, OSError) as e:
+                log.error("Failed to upload file %s: %s", src.name, e)
+                return False
+
+        log.info(
+            "Uploaded %s to ftp://<redacted>/%s (%.1fkB uploaded)",
+            str(src),
+            str(self.conf.destination),
+            src_stat.st_size / 1024,
+        )
+        return True